@@ -1,11 +1,28 @@
 # app/__init__.py
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys # Import sys to output logs to stdout
 
 logger = logging.getLogger(__name__) # Keep the logger instance
 
+# Background thread writing queued log records; kept at module level so it
+# can be stopped on reconfiguration and at exit
+_log_listener = None
+
+def _stop_log_listener():
+    """Flush and stop the background log writer, if running."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+atexit.register(_stop_log_listener)
+
 def setup_logging(config):
     """Configure application logging based on the loaded config."""
+    global _log_listener
     log_level = config.get('logging', {}).get('level', 'INFO').upper()
     log_format = config.get('logging', {}).get('format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
@@ -15,6 +32,7 @@ def setup_logging(config):
     # Remove existing handlers to avoid duplicate logs if re-configured
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    _stop_log_listener()
 
     # Configure the root logger
     root_logger.setLevel(log_level)
@@ -28,10 +46,14 @@ def setup_logging(config):
     formatter = logging.Formatter(log_format)
     handler.setFormatter(formatter)
 
-    # Add the handler to the root logger
-    root_logger.addHandler(handler)
+    # Request threads only enqueue records; a single listener thread does
+    # the blocking write to stdout
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _log_listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _log_listener.start()
 
     logger.info(f"Logging configured with level: {log_level}")
 
 # The logger instance is still available for use in this module if needed
-# logger.info("App package initialized") # Example log
\ No newline at end of file
+# logger.info("App package initialized") # Example log
@@ -1,56 +1,78 @@
 # app/api/middleware.py
 from flask import Response
 from functools import wraps
-from typing import Dict, Callable
+from typing import Callable, Iterable, Tuple
 
-def add_headers(response: Response, headers_dict: Dict[str, str]) -> Response:
-    """Add headers to Flask response."""
-    for header_name, header_value in headers_dict.items():
-        response.headers[header_name] = header_value
+# Rejection bodies are pre-encoded so shedding load costs less than serving
+RATE_LIMIT_ERROR_BODY = b'{"error":"Rate limit exceeded"}'
+OVERLOADED_ERROR_BODY = b'{"error":"Service overloaded, try again later"}'
+
+def add_headers(response: Response, headers: Iterable[Tuple[str, str]]) -> Response:
+    """Add (name, value) header pairs to Flask response."""
+    response.headers.extend(headers)
     return response
 
 def apply_rate_limit(f: Callable, rate_limiter, enabled: bool):
     """Rate limiting middleware decorator"""
+    if not enabled:
+        return f
+
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not enabled:
-            return f(*args, **kwargs)
-        
         # Check rate limit
-        pass_check, headers = rate_limiter.check()
-        if not pass_check:
-            response = {"error": "Rate limit exceeded"}
+        headers = []
+        if not rate_limiter.check(headers):
+            response = Response(RATE_LIMIT_ERROR_BODY, mimetype='application/json')
             return add_headers(response, headers), 429
-        
+
         # Call the original function
         response, status_code = f(*args, **kwargs)
-        
+
         # Add rate limit headers
         return add_headers(response, headers), status_code
-    
+
     return decorated_function
 
 def apply_throttling(f: Callable, request_throttler, enabled: bool):
     """Throttling middleware decorator"""
+    if not enabled:
+        return f
+
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not enabled:
-            return f(*args, **kwargs)
-        
         # Check throttling
-        pass_check, headers = request_throttler.acquire()
-        if not pass_check:
-            response = {"error": "Service overloaded, try again later"}
+        headers = []
+        if not request_throttler.acquire(headers):
+            response = Response(OVERLOADED_ERROR_BODY, mimetype='application/json')
             return add_headers(response, headers), 503
-        
+
         try:
             # Call the original function
             response, status_code = f(*args, **kwargs)
-            
+
             # Add throttling headers
             return add_headers(response, headers), status_code
         finally:
             # Always release the resource
             request_throttler.release()
-    
-    return decorated_function
\ No newline at end of file
+
+    return decorated_function
+
+def apply_limit_headers(f: Callable, rate_limiter, request_throttler, rate_limit_enabled: bool, throttling_enabled: bool):
+    """Decorator reporting rate limit and throttling state without consuming either"""
+    if not rate_limit_enabled and not throttling_enabled:
+        return f
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response, status_code = f(*args, **kwargs)
+
+        headers = []
+        if rate_limit_enabled:
+            rate_limiter.peek(headers)
+        if throttling_enabled:
+            request_throttler.peek(headers)
+
+        return add_headers(response, headers), status_code
+
+    return decorated_function
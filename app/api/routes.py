@@ -1,108 +1,85 @@
 # app/api/routes.py
+import msgspec
+import orjson
 from flask import jsonify, request, Response
 from typing import Dict, Tuple
-from app.api.middleware import apply_rate_limit, apply_throttling, add_headers
+from app.api.middleware import apply_rate_limit, apply_throttling, apply_limit_headers
+
+class TranslateRequest(msgspec.Struct):
+    """JSON body accepted by the /translate endpoint"""
+    text: str
+    source: str
+    target: str
+    outputFormat: str = 'json'
 
 def register_routes(app, config, rate_limiter, request_throttler, translation_manager):
     """Register all routes for the application"""
     
+    # The configuration does not change while the app is running, so the
+    # static parts of the introspection payloads are built once here.
+    service_info = {
+        "rateLimit": config["rate_limit"],
+        "throttling": config["throttling"],
+        "formats": config["formats"]
+    }
+    config_json = app.json.dumps(public_config(config)).encode()
+    
+    # Middleware is bound once here; disabled features add no per-request work
+    rate_limit_enabled = config["rate_limit"]["enabled"]
+    throttling_enabled = config["throttling"]["enabled"]
+    
+    # Settings read by every /translate request, resolved once
+    max_chars = config["translation"]["max_chars_per_request"]
+    available_packages = config["translation"]["available_packages"]
+    available_set = config["translation"]["_available_packages_set"]
+    fallback_response = config["translation"]["fallback_response"]
+    output_formats = config["formats"]["output"]
+    
+    def limited(f):
+        """Rate limit and throttle an endpoint"""
+        f = apply_throttling(f, request_throttler, throttling_enabled)
+        return apply_rate_limit(f, rate_limiter, rate_limit_enabled)
+    
+    def reports_limits(f):
+        """Report limiter state on an endpoint without consuming it"""
+        return apply_limit_headers(f, rate_limiter, request_throttler, rate_limit_enabled, throttling_enabled)
+    
     @app.route('/health', methods=['GET'])
-    def health_check() -> Response:
+    @reports_limits
+    def health_check() -> Tuple[Response, int]:
         """Health check endpoint."""
-        headers = {}
         response = jsonify({
             "status": "ok", 
             "installedPackages": list(translation_manager.installed_packages),
-            "serviceInfo": {
-                "rateLimit": config["rate_limit"],
-                "throttling": config["throttling"],
-                "formats": config["formats"]
-            }
+            "translationCache": translation_manager.cache_info(),
+            "serviceInfo": service_info
         })
-        
-        # Apply rate limiting if enabled
-        if config["rate_limit"]["enabled"]:
-            _, rate_headers = rate_limiter.check()
-            headers.update(rate_headers)
-        
-        # Apply throttling if enabled
-        if config["throttling"]["enabled"]:
-            _, throttle_headers = request_throttler.acquire()
-            headers.update(throttle_headers)
-            request_throttler.release()
-        
-        return add_headers(response, headers)
+        return response, 200
     
+    # Kept as a sync view on purpose: under WSGI, Flask runs async views in
+    # a per-request event loop on the same worker thread, so offloading the
+    # model call with asyncio.to_thread() would not free the worker. Request
+    # concurrency comes from gunicorn's worker threads instead, and
+    # CTranslate2 releases the GIL while decoding.
     @app.route('/translate', methods=['POST'])
-    def translate() -> Response:
+    @limited
+    def translate() -> Tuple[Response, int]:
         """Translation endpoint with rate limiting and throttling."""
-        headers = {}
-        
-        # Apply rate limiting if enabled
-        if config["rate_limit"]["enabled"]:
-            rate_pass, rate_headers = rate_limiter.check()
-            headers.update(rate_headers)
-            if not rate_pass:
-                response = jsonify({"error": "Rate limit exceeded"})
-                return add_headers(response, headers), 429
-        
-        # Apply throttling if enabled
-        if config["throttling"]["enabled"]:
-            throttle_pass, throttle_headers = request_throttler.acquire()
-            headers.update(throttle_headers)
-            if not throttle_pass:
-                response = jsonify({"error": "Service overloaded, try again later"})
-                return add_headers(response, headers), 503
-            
-            # Ensure we release the semaphore even if an error occurs
-            try:
-                result, status_code = process_translation_request(
-                    request, 
-                    translation_manager, 
-                    config["translation"]["max_chars_per_request"],
-                    config["translation"]["available_packages"],
-                    config["translation"]["fallback_response"],
-                    config["formats"]["output"]
-                )
-                
-                # Add headers to the response
-                return add_headers(result, headers), status_code
-            finally:
-                request_throttler.release()
-        else:
-            # Process without throttling
-            result, status_code = process_translation_request(
-                request, 
-                translation_manager, 
-                config["translation"]["max_chars_per_request"],
-                config["translation"]["available_packages"],
-                config["translation"]["fallback_response"],
-                config["formats"]["output"]
-            )
-            
-            # Add headers if any
-            if headers:
-                return add_headers(result, headers), status_code
-            return result, status_code
+        return process_translation_request(
+            request, 
+            translation_manager, 
+            max_chars,
+            available_packages,
+            available_set,
+            fallback_response,
+            output_formats
+        )
     
     @app.route('/config', methods=['GET'])
-    def get_config() -> Response:
+    @reports_limits
+    def get_config() -> Tuple[Response, int]:
         """Get current configuration."""
-        headers = {}
-        response = jsonify(config)
-        
-        # Apply rate limiting if enabled
-        if config["rate_limit"]["enabled"]:
-            _, rate_headers = rate_limiter.check()
-            headers.update(rate_headers)
-        
-        # Apply throttling if enabled
-        if config["throttling"]["enabled"]:
-            _, throttle_headers = request_throttler.acquire()
-            headers.update(throttle_headers)
-            request_throttler.release()
-        
-        return add_headers(response, headers)
+        return Response(config_json, mimetype='application/json'), 200
     
     @app.route('/config', methods=['PUT'])
     def update_config() -> Response:
@@ -111,11 +88,20 @@ def register_routes(app, config, rate_limiter, request_throttler, translation_ma
         # Similar to original code but adapted to modular structure
         return jsonify({"message": "Configuration update endpoint"}), 200
 
+def public_config(config: Dict) -> Dict:
+    """Return a copy of the config without internal, underscore-prefixed keys."""
+    return {
+        key: public_config(value) if isinstance(value, dict) else value
+        for key, value in config.items()
+        if not key.startswith('_')
+    }
+
 def process_translation_request(
     req, 
     translation_manager, 
     max_chars, 
     available_packages,
+    available_set,
     fallback_response,
     output_formats
 ) -> Tuple[Response, int]:
@@ -126,32 +112,39 @@ def process_translation_request(
         Tuple of (response, status_code)
     """
     try:
-        # Determine input format
-        content_type = req.headers.get('Content-Type', '')
-        
-        if 'application/json' in content_type:
-            # JSON input
-            data = req.json
-            
-            # Required fields
-            if not all(key in data for key in ['text', 'source', 'target']):
-                return jsonify({
-                    "error": "Missing required fields. Need 'text', 'source', and 'target'"
-                }), 400
+        # Determine input format from the parsed mimetype
+        if req.is_json:
+            # JSON input, parsed and validated in a single pass
+            try:
+                body = msgspec.json.decode(req.get_data(cache=False), type=TranslateRequest)
+            except msgspec.ValidationError as e:
+                # e.g. "Object missing required field `target`"
+                return jsonify({"error": f"Invalid request: {e}"}), 400
+            except msgspec.DecodeError:
+                return jsonify({"error": "Request body is not valid JSON"}), 400
             
-            text = data['text']
-            source_lang = data['source']
-            target_lang = data['target']
-            output_format = data.get('outputFormat', 'json')
+            text = body.text
+            source_lang = body.source
+            target_lang = body.target
+            output_format = body.outputFormat
             
         else:
-            # Form data or query parameters
-            text = req.form.get('text') or req.args.get('text')
-            source_lang = req.form.get('source') or req.args.get('source')
-            target_lang = req.form.get('target') or req.args.get('target')
-            output_format = req.form.get('outputFormat') or req.args.get('outputFormat') or 'text'
+            # Form data or query parameters, form taking precedence
+            form = req.form
+            args = req.args
+            params = {}
+            for key in ('text', 'source', 'target', 'outputFormat'):
+                value = form.get(key)
+                if value is None:
+                    value = args.get(key)
+                params[key] = value
+            
+            text = params['text']
+            source_lang = params['source']
+            target_lang = params['target']
+            output_format = params['outputFormat'] or 'text'
             
-            if not all([text, source_lang, target_lang]):
+            if text is None or source_lang is None or target_lang is None:
                 return jsonify({
                     "error": "Missing required parameters. Need 'text', 'source', and 'target'"
                 }), 400
@@ -170,7 +163,7 @@ def process_translation_request(
         
         # Check if language pair is supported
         language_pair = f"{source_lang}-{target_lang}"
-        if language_pair not in available_packages:
+        if language_pair not in available_set:
             return jsonify({
                 "error": f"Unsupported language pair: {language_pair}. Supported pairs: {available_packages}"
             }), 400
@@ -185,12 +178,12 @@ def process_translation_request(
         
         # Return result based on requested output format
         if output_format == "json":
-            response = jsonify({
+            response = Response(orjson.dumps({
                 "translated": translated_text,
                 "source": source_lang,
                 "target": target_lang,
                 "original": text
-            })
+            }), mimetype='application/json')
             # Add X-Translation-Info header
             response.headers['X-Translation-Characters'] = str(len(text))
             return response, 200
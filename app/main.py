@@ -7,6 +7,7 @@ from app.api.routes import register_routes
 from app.services.rate_limiter import RateLimiter
 from app.services.request_throttler import RequestThrottler
 from app.services.translation_service import TranslationPackageManager
+from app.utils.json_provider import OrjsonProvider
 from config.config_loader import load_config
 from app import setup_logging # Import the setup function
 
@@ -20,6 +21,7 @@ def create_app(test_config=None):
     """Create and configure the Flask application"""
     app = Flask(__name__, instance_relative_config=True)
     CORS(app)  # Enable CORS for all routes
+    app.json = OrjsonProvider(app)  # Faster jsonify and request.get_json
     
     # Initialize services
     initialize_services(test_config)
@@ -40,6 +42,11 @@ def initialize_services(test_config=None):
     else:
         config = test_config
     
+    # Derived lookup for the /translate hot path; load_config builds it,
+    # configs passed in directly may not have it
+    if "_available_packages_set" not in config["translation"]:
+        config["translation"]["_available_packages_set"] = frozenset(config["translation"]["available_packages"])
+    
     # Setup logging
     setup_logging(config)
 
@@ -58,9 +65,18 @@ def initialize_services(test_config=None):
     translation_manager = TranslationPackageManager()
     translation_manager.install_configured_packages(config["translation"]["available_packages"])
 
+def warmup_translations():
+    """Load the configured translation models in this process, if enabled"""
+    # Not done in initialize_services: with gunicorn's preload_app that runs
+    # in the master, and the CTranslate2 translators created by a warmup
+    # start native threads that do not survive the fork into the workers.
+    if config["translation"].get("warmup", False):
+        translation_manager.warmup(config["translation"]["available_packages"])
+
 # Create the application instance
 app = create_app()
 
 if __name__ == "__main__":
+    warmup_translations()
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port)
\ No newline at end of file
@@ -1,7 +1,12 @@
 # app/services/rate_limiter.py
 import time
 from threading import Lock
-from typing import Dict, Tuple
+from typing import List, Tuple
+
+# Tokens are tracked as integer micro-tokens
+MICRO_TOKENS = 1_000_000
+# Fractional bits of the fixed-point refill rate
+RATE_SHIFT = 32
 
 class RateLimiter:
     """
@@ -10,42 +15,71 @@ class RateLimiter:
     def __init__(self, requests_per_minute: int, burst: int):
         self.requests_per_minute = requests_per_minute
         self.burst = burst
-        self.tokens = burst
-        self.last_check = time.time()
+        self.capacity_micro = burst * MICRO_TOKENS
+        self.tokens_micro = self.capacity_micro
+        self.last_ns = time.monotonic_ns()
+        # Micro-tokens added per nanosecond, as a 32.32 fixed-point integer.
+        # Rounded up so a whole token is back after exactly Retry-After seconds.
+        self.rate_micro_per_ns = -(-(requests_per_minute * MICRO_TOKENS << RATE_SHIFT) // (60 * 1_000_000_000))
+        # A plain Lock, not a spinlock: see "Why a plain threading.Lock" in rate_limiter.md
         self.lock = Lock()
+        # Header constants, computed once: micro-tokens refilled per minute
+        # (the divisor for all seconds-until calculations) and the limit string
+        self._rpm_micro = requests_per_minute * MICRO_TOKENS
+        self._limit_str = str(requests_per_minute)
     
-    def check(self) -> Tuple[bool, Dict[str, str]]:
+    def check(self, headers: List[Tuple[str, str]]) -> bool:
         """
         Check if a request can be processed under the rate limit
         
+        Args:
+            headers: List the rate limit (name, value) headers are appended to
+        
         Returns:
-            Tuple of (allowed: bool, headers: Dict[str, str])
+            bool: Whether the request is allowed
         """
+        # Only the bucket update runs under the lock; header formatting
+        # works on a snapshot taken inside it.
         with self.lock:
-            now = time.time() # returns time in seconds since epoch
-            time_passed = now - self.last_check # seconds since last check
-            self.last_check = now
-            
-            # Add tokens based on time passed: 1 token per seconds passed
-            self.tokens += time_passed * (self.requests_per_minute / 60.0)
-            
-            # Cap tokens to burst limit
-            if self.tokens > self.burst:
-                self.tokens = self.burst
-            
-            # Prepare headers with rate limit information
-            headers = {
-                'X-RateLimit-Limit': f"{self.requests_per_minute}",
-                'X-RateLimit-Remaining': f"{self.tokens:.1f}",
-                'X-RateLimit-Reset': f"{int(60 * (1 - (self.tokens / self.requests_per_minute)))}",
-            }
+            # Monotonic clock: immune to wall clock (NTP) adjustments
+            now = time.monotonic_ns()
+            tokens = self._refill(now)
+            self.last_ns = now
             
             # Check if we have at least 1 token
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return True, headers
-            else:
-                # Calculate wait time until next token is available
-                wait_time = (1 - self.tokens) * (60 / self.requests_per_minute)
-                headers['Retry-After'] = f"{int(wait_time)}"
-                return False, headers
\ No newline at end of file
+            allowed = tokens >= MICRO_TOKENS
+            self.tokens_micro = tokens - MICRO_TOKENS if allowed else tokens
+        
+        # Prepare headers with rate limit information
+        self._add_headers(headers, tokens)
+        
+        if not allowed:
+            # Calculate wait time until next token is available, rounded up
+            wait_time = -((tokens - MICRO_TOKENS) * 60 // self._rpm_micro)
+            headers.append(('Retry-After', f"{wait_time}"))
+        return allowed
+    
+    def peek(self, headers: List[Tuple[str, str]]) -> None:
+        """
+        Report the current rate limit state without consuming a token
+        
+        Args:
+            headers: List the rate limit (name, value) headers are appended to
+        """
+        # Read-only: no lock, the snapshot may be marginally stale
+        self._add_headers(headers, self._refill(time.monotonic_ns()))
+    
+    def _refill(self, now: int) -> int:
+        """Return the token count at `now`, capped to the burst limit"""
+        elapsed = now - self.last_ns
+        tokens = self.tokens_micro + ((elapsed * self.rate_micro_per_ns) >> RATE_SHIFT)
+        return min(tokens, self.capacity_micro)
+    
+    def _add_headers(self, headers: List[Tuple[str, str]], tokens: int) -> None:
+        """Append the rate limit headers for the given micro-token count"""
+        headers.extend((
+            ('X-RateLimit-Limit', self._limit_str),
+            ('X-RateLimit-Remaining', f"{tokens // MICRO_TOKENS}.{tokens % MICRO_TOKENS // (MICRO_TOKENS // 10)}"),
+            # Seconds (rounded up) until the bucket is back at burst capacity
+            ('X-RateLimit-Reset', f"{-((tokens - self.capacity_micro) * 60 // self._rpm_micro)}"),
+        ))
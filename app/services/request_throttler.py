@@ -1,7 +1,6 @@
 # app/services/request_throttler.py
 import threading
-from threading import Lock
-from typing import Dict, Tuple
+from typing import List, Tuple
 
 class RequestThrottler:
     """
@@ -9,35 +8,56 @@ class RequestThrottler:
     """
     def __init__(self, max_concurrent: int):
         self.semaphore = threading.Semaphore(max_concurrent)
-        self.lock = Lock()
         self.max_concurrent = max_concurrent
-        self.current_requests = 0
+        # Static header value, formatted once
+        self._limit_str = str(max_concurrent)
     
-    def acquire(self) -> Tuple[bool, Dict[str, str]]:
+    @property
+    def current_requests(self) -> int:
+        """Number of requests currently holding a slot"""
+        # The semaphore already counts free slots, so usage is derived from
+        # it instead of being tracked under a separate lock. Reading the
+        # private Semaphore._value is deliberate: a plain int counter updated
+        # without a lock could lose increments and drift. The read may be
+        # slightly stale under concurrency, which is fine for headers.
+        return max(0, self.max_concurrent - self.semaphore._value)
+    
+    def acquire(self, headers: List[Tuple[str, str]]) -> bool:
         """
         Try to acquire permission to process a request
         
+        Args:
+            headers: List the throttling (name, value) headers are appended to
+        
         Returns:
-            Tuple of (allowed: bool, headers: Dict[str, str])
+            bool: Whether the request may proceed
         """
-        with self.lock:
-            # Try to acquire without blocking
-            result = self.semaphore.acquire(blocking=False)
-            
-            if result:
-                self.current_requests += 1
-            
-            # Prepare headers with throttling information
-            headers = {
-                'X-Throttle-Limit': f"{self.max_concurrent}",
-                'X-Throttle-Usage': f"{self.current_requests}",
-                'X-Throttle-Remaining': f"{self.max_concurrent - self.current_requests}" if result else "0"
-            }
-            
-            return result, headers
+        # Try to acquire without blocking
+        result = self.semaphore.acquire(blocking=False)
+        current_requests = self.current_requests
+        
+        # Prepare headers with throttling information
+        self._add_headers(headers, current_requests, result)
+        
+        return result
+    
+    def peek(self, headers: List[Tuple[str, str]]) -> None:
+        """
+        Report current throttling usage without taking a slot
+        
+        Args:
+            headers: List the throttling (name, value) headers are appended to
+        """
+        self._add_headers(headers, self.current_requests, True)
     
     def release(self) -> None:
         """Release the semaphore after processing a request"""
-        with self.lock:
-            self.current_requests = max(0, self.current_requests - 1)
-            self.semaphore.release()
\ No newline at end of file
+        self.semaphore.release()
+    
+    def _add_headers(self, headers: List[Tuple[str, str]], current_requests: int, allowed: bool) -> None:
+        """Append the throttling headers for the given usage"""
+        headers.extend((
+            ('X-Throttle-Limit', self._limit_str),
+            ('X-Throttle-Usage', f"{current_requests}"),
+            ('X-Throttle-Remaining', f"{self.max_concurrent - current_requests}" if allowed else "0")
+        ))
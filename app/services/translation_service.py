@@ -1,11 +1,48 @@
 # app/services/translation_service.py
 import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from filelock import FileLock, Timeout
 import argostranslate.package
+import argostranslate.settings
 import argostranslate.translate
-import os # Import os for path operations if needed, though argostranslate handles paths internally
+from app.utils.helpers import timed_lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent package downloads at startup
+MAX_INSTALL_WORKERS = 8
+
+# Seconds during which an unforced sync reuses the last scan of the disk
+SYNC_INTERVAL = 1.0
+
+# Seconds before translate() retries installing a missing package
+INSTALL_RETRY_INTERVAL = 600
+
+# Parsed package index shared by all worker processes, and how long in
+# seconds it is used before being fetched again
+INDEX_CACHE_PATH = os.environ.get(
+    'ARGOS_INDEX_CACHE',
+    os.path.join(argostranslate.settings.cache_dir, 'available_packages.pkl')
+)
+INDEX_CACHE_TTL = 86400
+
+# Seconds to wait for another worker to finish refreshing the index cache
+INDEX_LOCK_TIMEOUT = 60
+
+# Translation result cache: number of entries, entry lifetime in seconds,
+# and the longest text cached
+TRANSLATION_CACHE_SIZE = 4096
+TRANSLATION_CACHE_TTL = 3600
+MAX_CACHED_TEXT_LENGTH = 512
+
+class _TranslationUnavailable(Exception):
+    """No translation is available for a language pair (already logged)"""
+
 class TranslationPackageManager:
     """
     Manages translation packages and performs translations.
@@ -13,50 +50,140 @@ class TranslationPackageManager:
     """
     def __init__(self):
         self.installed_packages = set()
+        # Guards installed_packages while packages install in parallel
+        self._lock = threading.Lock()
+        # Lookup tables for translate(), built lazily from the installed
+        # languages. They are rebuilt when _lang_cache_version moves past the
+        # version they were built for, i.e. after the installed packages change.
+        self._lang_cache_version = 0
+        self._lang_by_code = {}
+        self._lang_by_code_version = -1
+        self._translation_cache = {}
+        # time.monotonic() of the last scan of the installed packages
+        self._last_sync = None
+        # time.monotonic() of the last on-demand install attempt per package
+        self._install_attempts = {}
+        # Repeated inputs (UI strings, common phrases) skip the model entirely
+        self._translate_cached = timed_lru_cache(
+            seconds=TRANSLATION_CACHE_TTL, maxsize=TRANSLATION_CACHE_SIZE
+        )(self._translate_uncached)
         self.update_available_packages()
-        self._sync_installed_packages() # Sync with disk on init
+        self._sync_installed_packages(force=True) # Sync with disk on init
 
-    def _sync_installed_packages(self) -> None:
-        """Synchronize the internal set with actually installed packages."""
+    def _sync_installed_packages(self, force: bool = False) -> None:
+        """
+        Synchronize the internal set with actually installed packages.
+
+        Args:
+            force: Scan the disk even if it was scanned within SYNC_INTERVAL
+        """
+        now = time.monotonic()
+        if not force and self._last_sync is not None and now - self._last_sync < SYNC_INTERVAL:
+            return
+        self._last_sync = now
         logger.debug("Syncing installed packages from disk...")
-        self.installed_packages.clear()
         try:
             installed = argostranslate.package.get_installed_packages()
-            for pkg in installed:
-                # Assuming pkg object has from_code and to_code attributes
-                # Adjust if the structure is different
-                if hasattr(pkg, 'from_code') and hasattr(pkg, 'to_code'):
-                     package_key = f"{pkg.from_code}-{pkg.to_code}"
-                     self.installed_packages.add(package_key)
-                # Handle potential variations in package object structure if necessary
-                # elif hasattr(pkg, 'metadata'): # Example alternative check
-                #    metadata = pkg.metadata
-                #    if 'from_code' in metadata and 'to_code' in metadata:
-                #       package_key = f"{metadata['from_code']}-{metadata['to_code']}"
-                #       self.installed_packages.add(package_key)
-            logger.info(f"Found {len(self.installed_packages)} installed packages on disk.")
+            # argostranslate packages always carry from_code and to_code
+            installed_keys = {f"{pkg.from_code}-{pkg.to_code}" for pkg in installed}
+            # Swap in the new set so lock-free readers never see a
+            # partially synced one; on error the previous set is kept
+            with self._lock:
+                changed = installed_keys != self.installed_packages
+                self.installed_packages = installed_keys
+            if changed:
+                # e.g. installed by another worker process
+                self._invalidate_language_cache()
+            logger.info("Found %d installed packages on disk.", len(self.installed_packages))
         except Exception as e:
-            logger.error(f"Error syncing installed packages: {str(e)}")
+            logger.error("Error syncing installed packages: %s", e)
+
 
+    def update_available_packages(self, force: bool = False) -> None:
+        """
+        Load the available packages, from the on-disk index cache when fresh.
 
-    def update_available_packages(self) -> None:
-        """Download package index and update available packages."""
+        Args:
+            force: Download the package index even if the cache is fresh
+        """
         try:
-            argostranslate.package.update_package_index()
-            self.available_packages = argostranslate.package.get_available_packages()
-            logger.info(f"Available packages index updated. Found {len(self.available_packages)} packages.")
+            os.makedirs(os.path.dirname(INDEX_CACHE_PATH) or '.', exist_ok=True)
+            # Workers booting together wait here for the first one to
+            # refresh the cache instead of all downloading the index
+            try:
+                with FileLock(f"{INDEX_CACHE_PATH}.lock", timeout=INDEX_LOCK_TIMEOUT):
+                    available_packages = None if force else self._load_index_cache()
+                    if available_packages is None:
+                        argostranslate.package.update_package_index()
+                        available_packages = argostranslate.package.get_available_packages()
+                        self._save_index_cache(available_packages)
+            except Timeout:
+                # Don't block forever on a stuck holder; use whatever index
+                # is already on disk, even if it has expired
+                logger.warning("Timed out waiting for the package index lock; using the cached index.")
+                available_packages = self._load_index_cache(max_age=None) or []
+            self.available_packages = available_packages
+            # Index by language pair so install_package can look up in O(1)
+            self._available_index = {
+                (pkg.from_code, pkg.to_code): pkg
+                for pkg in self.available_packages
+            }
+            logger.info("Available packages index updated. Found %d packages.", len(self.available_packages))
         except Exception as e:
-             logger.error(f"Failed to update package index: {str(e)}")
+             logger.error("Failed to update package index: %s", e)
              self.available_packages = [] # Ensure it's an empty list on failure
+             self._available_index = {}
+
+    def _load_index_cache(self, max_age=INDEX_CACHE_TTL):
+        """
+        Read the available packages from the index cache.
+
+        Args:
+            max_age: Seconds after which the cache is ignored, or None to accept any age
+
+        Returns:
+            The cached package list, or None if missing, expired or unreadable
+        """
+        try:
+            if max_age is not None and os.stat(INDEX_CACHE_PATH).st_mtime <= time.time() - max_age:
+                return None
+            with open(INDEX_CACHE_PATH, 'rb') as f:
+                available_packages = pickle.load(f)
+            logger.debug("Loaded package index from %s", INDEX_CACHE_PATH)
+            return available_packages
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable package index cache %s: %s", INDEX_CACHE_PATH, e)
+            return None
+
+    def _save_index_cache(self, available_packages) -> None:
+        """Write the available packages to the index cache atomically."""
+        if not available_packages:
+            # Most likely a failed download; let the next start retry it
+            return
+        tmp_path = f"{INDEX_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(available_packages, f)
+            # Readers see either the old or the new file, never a partial one
+            os.replace(tmp_path, INDEX_CACHE_PATH)
+        except Exception as e:
+            logger.warning("Could not write package index cache %s: %s", INDEX_CACHE_PATH, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
 
-    def install_package(self, from_code: str, to_code: str) -> bool:
+    def install_package(self, from_code: str, to_code: str, refresh_index: bool = True) -> bool:
         """
         Install a specific language package if not already installed on disk.
 
         Args:
             from_code: Source language code
             to_code: Target language code
+            refresh_index: Download the package index if the package is not in it
 
         Returns:
             bool: Success status (True if already installed or installed successfully)
@@ -65,58 +192,87 @@ class TranslationPackageManager:
 
         # Quick check against internal cache
         if package_key in self.installed_packages:
-            logger.debug(f"Package {package_key} already tracked as installed.")
+            logger.debug("Package %s already tracked as installed.", package_key)
             return True
 
         # Re-sync with disk to get the most current state
         self._sync_installed_packages()
         if package_key in self.installed_packages:
-            logger.info(f"Package {package_key} found on disk (previously untracked).")
+            logger.info("Package %s found on disk (previously untracked).", package_key)
             return True
 
-        logger.info(f"Attempting to install package {package_key}...")
+        logger.info("Attempting to install package %s...", package_key)
+
+        available_package = self._prepare_download(from_code, to_code, refresh_index)
+        if not available_package:
+            return False
+
+        try:
+            logger.info("Downloading package %s...", package_key)
+            download_path = available_package.download()
+        except Exception as e:
+            logger.error("Failed to download package %s: %s", package_key, e)
+            return False
+
+        return self._finalize_install(package_key, download_path)
 
-        # Find the package in the available index
-        available_package = next(
-            (
-                pkg for pkg in self.available_packages
-                if hasattr(pkg, 'from_code') and hasattr(pkg, 'to_code') and \
-                   pkg.from_code == from_code and pkg.to_code == to_code
-            ),
-            None
-        )
+    def _prepare_download(self, from_code: str, to_code: str, refresh_index: bool = True):
+        """
+        Find the package for a language pair in the available index.
+
+        Args:
+            from_code: Source language code
+            to_code: Target language code
+            refresh_index: Download the index again if the package is not in it
+
+        Returns:
+            The available package, or None if it is not in the index
+        """
+        package_key = f"{from_code}-{to_code}"
+        available_package = self._available_index.get((from_code, to_code))
 
         if not available_package:
-            logger.warning(f"Package {package_key} not found in available package index.")
+            logger.warning("Package %s not found in available package index.", package_key)
+            if not refresh_index:
+                return None
             # Attempt to update index again in case it was stale
-            self.update_available_packages()
-            available_package = next(
-                (
-                    pkg for pkg in self.available_packages
-                    if hasattr(pkg, 'from_code') and hasattr(pkg, 'to_code') and \
-                       pkg.from_code == from_code and pkg.to_code == to_code
-                ),
-                None
-            )
+            self.update_available_packages(force=True)
+            available_package = self._available_index.get((from_code, to_code))
             if not available_package:
-                 logger.error(f"Package {package_key} still not found after index update.")
-                 return False
+                 logger.error("Package %s still not found after index update.", package_key)
+                 return None
+
+        return available_package
+
+    def _finalize_install(self, package_key: str, download_path) -> bool:
+        """
+        Install a downloaded package and record it as installed.
 
+        Args:
+            package_key: Package code in format "from-to"
+            download_path: Path of the downloaded package file
 
-        # Download and install the package
+        Returns:
+            bool: Success status
+        """
         try:
-            logger.info(f"Downloading package {package_key}...")
-            download_path = available_package.download()
-            logger.info(f"Installing package {package_key} from {download_path}...")
-            argostranslate.package.install_from_path(download_path)
+            # argostranslate reuses any file already in its download directory,
+            # so a truncated download would fail to install on every retry.
+            # Move the file into a temporary directory on the same filesystem
+            # first; it is removed afterwards whether or not the install worked.
+            with tempfile.TemporaryDirectory(dir=os.path.dirname(download_path)) as tmp_dir:
+                package_path = os.path.join(tmp_dir, os.path.basename(download_path))
+                os.replace(download_path, package_path)
+                logger.info("Installing package %s from %s...", package_key, package_path)
+                argostranslate.package.install_from_path(package_path)
             # Successfully installed, update internal set
-            self.installed_packages.add(package_key)
-            logger.info(f"Package {package_key} installed successfully.")
-            # Clean up downloaded file if necessary (optional)
-            # os.remove(download_path)
+            with self._lock:
+                self.installed_packages.add(package_key)
+            self._invalidate_language_cache()
+            logger.info("Package %s installed successfully.", package_key)
             return True
         except Exception as e:
-            logger.error(f"Failed to install package {package_key}: {str(e)}")
+            logger.error("Failed to install package %s: %s", package_key, e)
             return False
 
     def install_configured_packages(self, packages_list) -> None:
@@ -130,24 +286,176 @@ class TranslationPackageManager:
             logger.warning("No packages configured for installation.")
             return
 
-        logger.info(f"Checking and installing configured packages: {packages_list}")
+        logger.info("Checking and installing configured packages: %s", packages_list)
         # Sync once before starting batch install for efficiency
-        self._sync_installed_packages()
+        self._sync_installed_packages(force=True)
 
+        candidates = {}
         for package_code in packages_list:
             try:
                 from_code, to_code = package_code.split("-")
-                # install_package now handles the check for existing installs
-                self.install_package(from_code, to_code)
             except ValueError:
-                logger.error(f"Invalid package code format in configuration: {package_code}")
+                logger.error("Invalid package code format in configuration: %s", package_code)
+                continue
+            package_key = f"{from_code}-{to_code}"
+            if package_key in self.installed_packages or package_key in candidates:
+                continue
+            available_package = self._prepare_download(from_code, to_code)
+            if available_package:
+                candidates[package_key] = available_package
+
+        if not candidates:
+            return
+
+        # Downloads are network bound, so run them concurrently: startup
+        # then waits for the slowest package instead of the sum of all.
+        # Installing writes to the shared package directory, so packages
+        # are installed one at a time on this thread as downloads finish.
+        with ThreadPoolExecutor(max_workers=min(MAX_INSTALL_WORKERS, len(candidates))) as executor:
+            futures = {}
+            for package_key, available_package in candidates.items():
+                logger.info("Downloading package %s...", package_key)
+                futures[executor.submit(available_package.download)] = package_key
+            for future in as_completed(futures):
+                package_key = futures[future]
+                try:
+                    download_path = future.result()
+                except Exception as e:
+                     logger.error("Failed to download package %s: %s", package_key, e)
+                     continue
+                self._finalize_install(package_key, download_path)
+
+
+    def warmup(self, packages_list) -> None:
+        """
+        Load the models of the given packages so the first requests do not.
+
+        argostranslate only loads a model when it first translates, which
+        would otherwise add seconds to the first request for each pair.
+
+        Args:
+            packages_list: List of package codes in format "from-to"
+        """
+        warmed = 0
+        for package_code in packages_list:
+            try:
+                from_code, to_code = package_code.split("-")
+            except ValueError:
+                continue # Already reported by install_configured_packages
+            translation = self._get_translation(from_code, to_code)
+            if translation is None:
+                continue
+            try:
+                translation.translate(" ")
+                warmed += 1
             except Exception as e:
-                 logger.error(f"Error processing configured package {package_code}: {str(e)}")
+                logger.warning("Could not warm up package %s: %s", package_code, e)
+        logger.info("Warmed up %s translation models.", warmed)
+
+    def _invalidate_language_cache(self) -> None:
+        """Mark the cached languages stale so the next lookup reloads them."""
+        self._lang_cache_version += 1
+
+    def _get_translation(self, from_code: str, to_code: str):
+        """
+        Look up the translation object for a language pair.
+
+        Args:
+            from_code: Source language code
+            to_code: Target language code
+
+        Returns:
+            The argostranslate translation object, or None if unavailable
+        """
+        version = self._lang_cache_version
+        if self._lang_by_code_version != version:
+            installed_languages = argostranslate.translate.get_installed_languages()
+            self._lang_by_code = {lang.code: lang for lang in installed_languages}
+            self._translation_cache = {}
+            self._lang_by_code_version = version
+
+        key = (from_code, to_code)
+        translation = self._translation_cache.get(key)
+        if translation is not None:
+            return translation
+
+        from_lang = self._lang_by_code.get(from_code)
+        to_lang = self._lang_by_code.get(to_code)
+
+        if not from_lang:
+            logger.warning("Source language '%s' not installed or available.", from_code)
+            return None
+
+        if not to_lang:
+            logger.warning("Target language '%s' not installed or available.", to_code)
+            return None
 
+        translation = from_lang.get_translation(to_lang)
+        if not translation:
+            logger.error("Could not get translation object from '%s' to '%s'. Package might be corrupted or incomplete.", from_code, to_code)
+            return None
+
+        self._translation_cache[key] = translation
+        return translation
+
+    def cache_info(self) -> dict:
+        """
+        Statistics of the translation result cache.
+
+        Returns:
+            dict: hits, misses, maxsize and currsize
+        """
+        info = self._translate_cached.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "maxsize": info.maxsize,
+            "currsize": info.currsize
+        }
+
+    def _translate_uncached(self, from_code: str, to_code: str, text: str) -> str:
+        """
+        Run the translation model for a language pair.
+
+        Raises:
+            _TranslationUnavailable: If no translation is available for the pair
+        """
+        translation = self._get_translation(from_code, to_code)
+        if translation is None:
+            # The package may have failed to install at startup; try again
+            # on demand, but only from the index already loaded and at most
+            # once per INSTALL_RETRY_INTERVAL so requests don't keep
+            # hitting the network.
+            if self._claim_install_attempt(from_code, to_code):
+                if self.install_package(from_code, to_code, refresh_index=False):
+                    translation = self._get_translation(from_code, to_code)
+            if translation is None:
+                raise _TranslationUnavailable(f"No translation available from '{from_code}' to '{to_code}'")
+
+        logger.debug("Performing translation from %s to %s", from_code, to_code)
+        return translation.translate(text)
+
+    def _claim_install_attempt(self, from_code: str, to_code: str) -> bool:
+        """
+        Record an on-demand install attempt for a language pair.
+
+        Returns:
+            bool: True if the caller should attempt the install, False if
+                another attempt was made within INSTALL_RETRY_INTERVAL
+        """
+        package_key = f"{from_code}-{to_code}"
+        now = time.monotonic()
+        with self._lock:
+            last_attempt = self._install_attempts.get(package_key)
+            if last_attempt is not None and now - last_attempt < INSTALL_RETRY_INTERVAL:
+                return False
+            self._install_attempts[package_key] = now
+        return True
 
     def translate(self, text: str, from_code: str, to_code: str, fallback_response: str) -> str:
         """
         Translate text using installed language packages.
+        Results for short texts are cached.
 
         Args:
             text: Text to translate
@@ -158,41 +466,24 @@ class TranslationPackageManager:
         Returns:
             str: Translated text or fallback response
         """
-        # Rely directly on get_installed_languages which checks the actual installation
+        # Nothing to translate; skip the model and the language lookups
+        if not text or text.isspace():
+            return text
+        if from_code == to_code:
+            return text
+
         try:
-            installed_languages = argostranslate.translate.get_installed_languages()
-            from_lang = next((lang for lang in installed_languages if lang.code == from_code), None)
-            to_lang = next((lang for lang in installed_languages if lang.code == to_code), None)
-
-            if not from_lang:
-                logger.warning(f"Source language '{from_code}' not installed or available.")
-                # Optionally attempt installation here if desired, but might slow down requests
-                # if not self.install_package(from_code, to_code): # Example: try installing on-demand
-                #    return fallback_response
-                # # Re-fetch languages if install was attempted
-                # installed_languages = argostranslate.translate.get_installed_languages()
-                # from_lang = next((lang for lang in installed_languages if lang.code == from_code), None)
-                # if not from_lang: return fallback_response # Still not available
-                return fallback_response # Keep it simple: return fallback if not found initially
-
-            if not to_lang:
-                 logger.warning(f"Target language '{to_code}' not installed or available.")
-                 # Optionally attempt installation here
-                 return fallback_response
-
-            translation = from_lang.get_translation(to_lang)
-            if not translation:
-                 logger.error(f"Could not get translation object from '{from_code}' to '{to_code}'. Package might be corrupted or incomplete.")
-                 return fallback_response
-
-            logger.debug(f"Performing translation from {from_code} to {to_code}")
-            translated_text = translation.translate(text)
-            return translated_text
-
-        except argostranslate.translate.LanguageNotInstalledError as e:
-             logger.warning(f"Translation failed: {str(e)}. Package for {from_code}-{to_code} might be missing or corrupted.")
-             return fallback_response
+            # Failures raise instead of returning, so they are never cached
+            if len(text) <= MAX_CACHED_TEXT_LENGTH:
+                return self._translate_cached(from_code, to_code, text)
+            return self._translate_uncached(from_code, to_code, text)
+
+        except _TranslationUnavailable:
+            # Already logged while resolving the language pair
+            return fallback_response
         except Exception as e:
-            # Catch other potential errors during translation
-            logger.error(f"An unexpected error occurred during translation from {from_code} to {to_code}: {str(e)}", exc_info=True)
-            return fallback_response
\ No newline at end of file
+            # Catch any error raised while resolving or running the translation
+            logger.error("An unexpected error occurred during translation from %s to %s: %s", from_code, to_code, e)
+            # The traceback is only collected and formatted when debugging
+            logger.debug("Translation traceback", exc_info=True)
+            return fallback_response
@@ -1,15 +1,24 @@
 # app/utils/helpers.py
+from collections import namedtuple
 from functools import wraps
-from flask import request, jsonify
+from threading import Lock
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+from flask import g, request, jsonify
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
 def timed_lru_cache(seconds=600, maxsize=128):
     """
     Decorator that provides an LRU cache with timeout.
     
+    Each entry expires on its own, `seconds` after it was stored, so hot
+    keys stay cached while stale ones are evicted.
+    
     Args:
         seconds: Maximum age of cache entry in seconds
         maxsize: Maximum size of the cache
@@ -18,28 +27,42 @@ def timed_lru_cache(seconds=600, maxsize=128):
         Decorated function with caching
     """
     def decorator(func):
-        # Use Python's built-in LRU cache
-        from functools import lru_cache
-        
-        # Caching wrapper
-        cached_func = lru_cache(maxsize=maxsize)(func)
-        
-        # Store time with each call
-        cache_info = {'last_clear': time.time()}
+        # TTLCache tracks expiry with time.monotonic, so wall clock
+        # adjustments do not expire or extend entries
+        cache = TTLCache(maxsize=maxsize, ttl=seconds)
+        # TTLCache is not thread safe
+        lock = Lock()
+        stats = {'hits': 0, 'misses': 0}
         
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Check if cache needs clearing
-            now = time.time()
-            if now - cache_info['last_clear'] > seconds:
-                cached_func.cache_clear()
-                cache_info['last_clear'] = now
+            key = hashkey(*args, **kwargs)
+            with lock:
+                try:
+                    result = cache[key]
+                    stats['hits'] += 1
+                    return result
+                except KeyError:
+                    stats['misses'] += 1
             
-            return cached_func(*args, **kwargs)
+            # Computed outside the lock so a slow call does not block others
+            result = func(*args, **kwargs)
+            with lock:
+                return cache.setdefault(key, result)
         
-        # Add cache info method
-        wrapper.cache_info = cached_func.cache_info
-        wrapper.cache_clear = cached_func.cache_clear
+        def cache_info():
+            with lock:
+                cache.expire()
+                return CacheInfo(stats['hits'], stats['misses'], maxsize, cache.currsize)
+        
+        def cache_clear():
+            with lock:
+                cache.clear()
+                stats['hits'] = stats['misses'] = 0
+        
+        # Same introspection API as functools.lru_cache
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
         
         return wrapper
     
@@ -47,7 +70,8 @@ def timed_lru_cache(seconds=600, maxsize=128):
 
 def validate_request_json(required_fields):
     """
-    Decorator to validate JSON request body has required fields
+    Decorator to validate JSON request body has required fields.
+    The parsed body is stored as `g.json` for the decorated view.
     
     Args:
         required_fields: List of required field names
@@ -61,7 +85,12 @@ def validate_request_json(required_fields):
             if not request.is_json:
                 return jsonify({"error": "Request must be JSON"}), 400
             
-            data = request.json
+            # Parsed once; malformed JSON is a client error, not a 500
+            data = request.get_json(cache=True, silent=True)
+            if data is None:
+                return jsonify({"error": "Invalid JSON"}), 400
+            g.json = data
+            
             missing = [field for field in required_fields if field not in data]
             
             if missing:
@@ -86,17 +115,21 @@ def log_request(level=logging.INFO):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Log request info
-            logger.log(level, f"Request: {request.method} {request.path} from {request.remote_addr}")
+            # Nothing is timed or formatted when the level is disabled
+            if not logger.isEnabledFor(level):
+                return f(*args, **kwargs)
             
             # Execute function
-            start_time = time.time()
+            start_time = time.perf_counter()
             response = f(*args, **kwargs)
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
-            # Log response info
+            # Log request and response info in one record
             status_code = response[1] if isinstance(response, tuple) else 200
-            logger.log(level, f"Response: {status_code} in {duration:.2f}s")
+            logger.log(
+                level, "Request: %s %s from %s -> %s in %.2fs",
+                request.method, request.path, request.remote_addr, status_code, duration
+            )
             
             return response
         return decorated_function
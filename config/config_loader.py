@@ -1,18 +1,52 @@
 # app/config/config_loader.py
+import copy
 import os
 import yaml
 import logging
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C parser when PyYAML was built with it, the pure Python one otherwise
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+def _parse_bool(value: str) -> bool:
+    """Parse a 'true'/'false' environment value."""
+    return value.lower() == 'true'
+
+# Environment variable overrides: (variable, path in config, conversion)
+ENV_MAP: List[Tuple[str, Tuple[str, ...], Callable[[str], Any]]] = [
+    ('RATE_LIMIT_ENABLED', ('rate_limit', 'enabled'), _parse_bool),
+    ('RATE_LIMIT_RPM', ('rate_limit', 'requests_per_minute'), int),
+    ('RATE_LIMIT_BURST', ('rate_limit', 'burst'), int),
+    ('THROTTLING_ENABLED', ('throttling', 'enabled'), _parse_bool),
+    ('THROTTLING_CONCURRENT', ('throttling', 'concurrent_requests'), int),
+    ('MAX_CHARS_PER_REQUEST', ('translation', 'max_chars_per_request'), int),
+    ('AVAILABLE_PACKAGES', ('translation', 'available_packages'), lambda value: value.split(',')),
+    ('ARGOS_WARMUP', ('translation', 'warmup'), lambda value: value.lower() in ('1', 'true')),
+    ('LOGGING_LEVEL', ('logging', 'level'), str.upper),
+    ('LOGGING_FORMAT', ('logging', 'format'), str),
+]
+
+# Loaded configurations, keyed by config file, its modification time and the
+# values of the environment overrides
+_CONFIG_CACHE: Dict[Tuple, Dict[str, Any]] = {}
+
 def update_nested_dict(d: Dict, u: Dict) -> Dict:
-    """Update nested dictionary recursively."""
-    for k, v in u.items():
-        if isinstance(v, dict) and k in d and isinstance(d[k], dict):
-            update_nested_dict(d[k], v)
-        else:
-            d[k] = v
+    """Update nested dictionary, merging nested dicts instead of replacing them."""
+    # Walked with an explicit stack, so deeply nested input cannot hit the
+    # recursion limit
+    stack = [(d, u)]
+    while stack:
+        target, updates = stack.pop()
+        for k, v in updates.items():
+            if isinstance(v, dict) and isinstance(target.get(k), dict):
+                stack.append((target[k], v))
+            else:
+                target[k] = v
     return d
 
 def load_config(config_path: str = None) -> Dict[str, Any]:
@@ -21,7 +55,19 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
     1. Environment variables
     2. YAML configuration file
     3. Default values
+    
+    Results are cached until the file or the environment overrides change;
+    each call returns its own copy.
     """
+    try:
+        mtime_ns = os.stat(config_path).st_mtime_ns if config_path else None
+    except OSError:
+        mtime_ns = None
+    cache_key = (config_path, mtime_ns, tuple(os.environ.get(env_var) for env_var, _, _ in ENV_MAP))
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    
     # Default configuration
     default_config = {
         "rate_limit": {
@@ -36,7 +82,8 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
         "translation": {
             "max_chars_per_request": 5000,
             "available_packages": ["en-es", "es-en", "en-fr", "fr-en", "en-de", "de-en", "it-en", "en-it"],
-            "fallback_response": "Translation service unavailable"
+            "fallback_response": "Translation service unavailable",
+            "warmup": False
         },
         "formats": {
             "input": ["json", "text"],
@@ -50,43 +97,33 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
     
     # Load from YAML file if provided
     config = default_config.copy()
-    if config_path and os.path.exists(config_path):
+    cacheable = True
+    if config_path and mtime_ns is not None:
         try:
             with open(config_path, 'r') as f:
-                yaml_config = yaml.safe_load(f)
+                yaml_config = yaml.load(f, Loader=_YamlLoader)
                 if yaml_config:
                     config = update_nested_dict(config, yaml_config)
                     logger.info(f"Configuration loaded from {config_path}")
         except Exception as e:
             logger.error(f"Error loading configuration from {config_path}: {str(e)}")
+            cacheable = False # Retry the file on the next load
     
     # Override with environment variables
-    if os.environ.get('RATE_LIMIT_ENABLED'):
-        config["rate_limit"]["enabled"] = os.environ.get('RATE_LIMIT_ENABLED').lower() == 'true'
-    
-    if os.environ.get('RATE_LIMIT_RPM'):
-        config["rate_limit"]["requests_per_minute"] = int(os.environ.get('RATE_LIMIT_RPM'))
-    
-    if os.environ.get('RATE_LIMIT_BURST'):
-        config["rate_limit"]["burst"] = int(os.environ.get('RATE_LIMIT_BURST'))
-    
-    if os.environ.get('THROTTLING_ENABLED'):
-        config["throttling"]["enabled"] = os.environ.get('THROTTLING_ENABLED').lower() == 'true'
-    
-    if os.environ.get('THROTTLING_CONCURRENT'):
-        config["throttling"]["concurrent_requests"] = int(os.environ.get('THROTTLING_CONCURRENT'))
-    
-    if os.environ.get('MAX_CHARS_PER_REQUEST'):
-        config["translation"]["max_chars_per_request"] = int(os.environ.get('MAX_CHARS_PER_REQUEST'))
-    
-    if os.environ.get('AVAILABLE_PACKAGES'):
-        config["translation"]["available_packages"] = os.environ.get('AVAILABLE_PACKAGES').split(',')
-    
-    if os.environ.get('LOGGING_LEVEL'):
-        config["logging"]["level"] = os.environ.get('LOGGING_LEVEL').upper()
+    for env_var, path, cast in ENV_MAP:
+        value = os.environ.get(env_var)
+        if not value:
+            continue
+        section = config
+        *keys, last = path
+        for key in keys:
+            section = section[key]
+        section[last] = cast(value)
 
-    if os.environ.get('LOGGING_FORMAT'):
-        config["logging"]["format"] = os.environ.get('LOGGING_FORMAT')
+    # Derived lookup for validating language pairs per request
+    config["translation"]["_available_packages_set"] = frozenset(config["translation"]["available_packages"])
 
+    if cacheable:
+        _CONFIG_CACHE[cache_key] = copy.deepcopy(config)
     logger.info("Configuration loaded successfully")
     return config
\ No newline at end of file
@@ -4,6 +4,13 @@ import os
 # Worker Processes
 workers = int(os.environ.get('GUNICORN_PROCESSES', '2'))
 threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+# Threaded workers: CTranslate2 releases the GIL while decoding, so a
+# worker's threads translate in parallel while sharing one copy of the models
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+# Load the app (config, package index, translation manager) once in the
+# master; workers share its memory copy-on-write instead of each loading it
+preload_app = True
 
 # Logging
 # Use '-' to log to stdout/stderr
@@ -20,4 +27,15 @@ bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
 
 # Other settings (optional)
 # reload = bool(os.environ.get('GUNICORN_RELOAD', False)) # Useful for development
-# timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
\ No newline at end of file
+# timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+
+def post_fork(server, worker):
+    """Re-create per-process state that does not survive fork."""
+    # The background log writer is a thread, and threads are not copied into
+    # the worker; restart it so the worker's log records are written out.
+    # The loaded app and translation manager are left as inherited.
+    from app import setup_logging
+    from app import main
+    setup_logging(main.config)
+    # Models are loaded here rather than in the master, see warmup_translations
+    main.warmup_translations()
@@ -0,0 +1,84 @@
+# tests/conftest.py
+import atexit
+import shutil
+import sys
+import tempfile
+import types
+import pytest
+from unittest.mock import MagicMock
+
+# Stand-in for argostranslate, installed before anything imports the real
+# package so its model stack (CTranslate2, SentencePiece, Stanza, torch)
+# is never loaded, and the app created by app.main never goes online
+_argos_cache_dir = tempfile.mkdtemp(prefix='u18n-tests-')
+atexit.register(shutil.rmtree, _argos_cache_dir, ignore_errors=True)
+fake_argos = types.ModuleType('argostranslate')
+fake_argos.package = MagicMock()
+fake_argos.translate = MagicMock()
+fake_argos.settings = types.SimpleNamespace(cache_dir=_argos_cache_dir)
+sys.modules['argostranslate'] = fake_argos
+sys.modules['argostranslate.package'] = fake_argos.package
+sys.modules['argostranslate.translate'] = fake_argos.translate
+sys.modules['argostranslate.settings'] = fake_argos.settings
+
+import app.services.translation_service as translation_service
+from app.services.translation_service import TranslationPackageManager
+
+@pytest.fixture(scope="session")
+def mock_argos():
+    """The mocked argostranslate submodules used by the translation service"""
+    return {'package': fake_argos.package, 'translate': fake_argos.translate}
+
+@pytest.fixture(autouse=True)
+def reset_argos(mock_argos):
+    """Clear calls and behaviour configured by the previous test"""
+    for mock in mock_argos.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+@pytest.fixture
+def mock_package(mock_argos):
+    """The mocked argostranslate.package"""
+    return mock_argos['package']
+
+@pytest.fixture
+def mock_translate(mock_argos):
+    """The mocked argostranslate.translate"""
+    return mock_argos['translate']
+
+@pytest.fixture(scope="session")
+def shared_lang_mocks():
+    """English and Spanish language mocks and their translation, built once"""
+    from_lang, to_lang, translation = MagicMock(), MagicMock(), MagicMock()
+    from_lang.code = "en"
+    to_lang.code = "es"
+    return from_lang, to_lang, translation
+
+@pytest.fixture
+def lang_mocks(shared_lang_mocks, mock_translate):
+    """Install the shared en and es languages, with en-es translating to "Hola mundo" """
+    from_lang, to_lang, translation = shared_lang_mocks
+    for mock in shared_lang_mocks:
+        # Return values are kept: resetting them would also reset the
+        # configured magic methods, e.g. make bool() return a MagicMock
+        mock.reset_mock(side_effect=True)
+    from_lang.get_translation.return_value = translation
+    translation.translate.return_value = "Hola mundo"
+    mock_translate.get_installed_languages.return_value = [from_lang, to_lang]
+    return shared_lang_mocks
+
+@pytest.fixture(autouse=True)
+def isolated_index_cache(tmp_path, monkeypatch):
+    """Keep the package index cache of each test in its own directory"""
+    monkeypatch.setattr(translation_service, 'INDEX_CACHE_PATH', str(tmp_path / 'available_packages.pkl'))
+
+@pytest.fixture
+def manager():
+    """Create a translation manager on the mocked argostranslate"""
+    return TranslationPackageManager()
+
+@pytest.fixture
+def installed_manager():
+    """Create a translation manager with the en-es package installed"""
+    manager = TranslationPackageManager()
+    manager.installed_packages = {"en-es"}
+    return manager
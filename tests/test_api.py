@@ -2,12 +2,13 @@
 import json
 import pytest
 from flask import Flask
+from app.api.middleware import RATE_LIMIT_ERROR_BODY, OVERLOADED_ERROR_BODY
 from app.main import create_app
 
 @pytest.fixture
-def app():
-    """Create application for testing"""
-    test_config = {
+def test_config():
+    """Application configuration for testing"""
+    return {
         "rate_limit": {
             "requests_per_minute": 100,
             "burst": 20,
@@ -27,6 +28,10 @@ def app():
             "output": ["json", "text"]
         }
     }
+
+@pytest.fixture
+def app(test_config):
+    """Create application for testing"""
     app = create_app(test_config)
     return app
 
@@ -35,6 +40,21 @@ def client(app):
     """Create test client"""
     return app.test_client()
 
+@pytest.fixture
+def limited_client(test_config, monkeypatch):
+    """Create test client with rate limiting (burst of 2) and throttling (1 slot) enabled"""
+    test_config["rate_limit"].update(requests_per_minute=1, burst=2, enabled=True)
+    test_config["throttling"].update(concurrent_requests=1, enabled=True)
+    app = create_app(test_config)
+    
+    from app.main import translation_manager
+    
+    def mock_translate(text, from_code, to_code, fallback_response):
+        return f"Translated: {text}"
+    
+    monkeypatch.setattr(translation_manager, "translate", mock_translate)
+    return app.test_client()
+
 def test_health_check(client):
     """Test health check endpoint"""
     response = client.get('/health')
@@ -43,6 +63,7 @@ def test_health_check(client):
     assert "status" in data
     assert data["status"] == "ok"
     assert "installedPackages" in data
+    assert "translationCache" in data
     assert "serviceInfo" in data
 
 def test_translate_json(client, monkeypatch):
@@ -121,6 +142,46 @@ def test_translate_missing_fields(client):
     data = json.loads(response.data)
     assert "error" in data
 
+def test_translate_malformed_json(client):
+    """Test translation with a body that is not valid JSON"""
+    response = client.post(
+        '/translate',
+        data='{"text": "Hello world", "source": "en",',
+        content_type='application/json'
+    )
+    
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data["error"] == "Request body is not valid JSON"
+
+def test_translate_wrong_field_type(client):
+    """Test translation with a field of the wrong type"""
+    payload = {"text": 1, "source": "en", "target": "es"}
+    
+    response = client.post(
+        '/translate',
+        data=json.dumps(payload),
+        content_type='application/json'
+    )
+    
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data["error"].startswith("Invalid request:")
+    assert "text" in data["error"]
+
+@pytest.mark.parametrize("body", ["[]", "null", '"Hello world"'])
+def test_translate_non_object_body(client, body):
+    """Test translation with a JSON body that is not an object"""
+    response = client.post(
+        '/translate',
+        data=body,
+        content_type='application/json'
+    )
+    
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data["error"].startswith("Invalid request:")
+
 def test_translate_unsupported_language(client):
     """Test translation with unsupported language pair"""
     # Test with unsupported language pair
@@ -149,4 +210,55 @@ def test_config_endpoint(client):
     assert "rate_limit" in data
     assert "throttling" in data
     assert "translation" in data
-    assert "formats" in data
\ No newline at end of file
+    assert "formats" in data
+    # Internal derived keys are not exposed
+    assert "_available_packages_set" not in data["translation"]
+
+TRANSLATE_PAYLOAD = {"text": "Hello world", "source": "en", "target": "es"}
+
+def test_rate_limit_exceeded(limited_client):
+    """Test requests beyond the burst are rejected with 429"""
+    responses = [limited_client.post('/translate', json=TRANSLATE_PAYLOAD) for _ in range(3)]
+    
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    rejected = responses[-1]
+    assert rejected.data == RATE_LIMIT_ERROR_BODY
+    assert rejected.mimetype == "application/json"
+    assert rejected.headers["X-RateLimit-Limit"] == "1"
+    assert rejected.headers["X-RateLimit-Remaining"] == "0.0"
+    # One token per minute
+    assert 0 < int(rejected.headers["Retry-After"]) <= 60
+    assert 0 < int(rejected.headers["X-RateLimit-Reset"]) <= 120
+
+def test_throttling_overloaded(limited_client):
+    """Test a request is rejected with 503 while all slots are taken, without leaking a slot"""
+    from app.main import request_throttler
+    
+    # Hold the only slot, as a long-running request would
+    assert request_throttler.acquire([])
+    response = limited_client.post('/translate', json=TRANSLATE_PAYLOAD)
+    
+    assert response.status_code == 503
+    assert response.data == OVERLOADED_ERROR_BODY
+    assert response.headers["X-Throttle-Remaining"] == "0"
+    # The rejected request did not take or release a slot
+    assert request_throttler.current_requests == 1
+    
+    request_throttler.release()
+    response = limited_client.post('/translate', json=TRANSLATE_PAYLOAD)
+    
+    assert response.status_code == 200
+    assert response.headers["X-Throttle-Usage"] == "1"
+    assert request_throttler.current_requests == 0
+
+def test_limit_headers_do_not_consume(limited_client):
+    """Test /health and /config report the limits without consuming them"""
+    for path in ['/health', '/config', '/health']:
+        response = limited_client.get(path)
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Remaining"] == "2.0"
+        assert response.headers["X-Throttle-Usage"] == "0"
+    
+    # The full burst is still available
+    responses = [limited_client.post('/translate', json=TRANSLATE_PAYLOAD) for _ in range(2)]
+    assert [response.status_code for response in responses] == [200, 200]
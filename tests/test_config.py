@@ -103,6 +103,22 @@ class TestConfig:
         assert config["translation"]["max_chars_per_request"] == 8000
         assert config["translation"]["available_packages"] == ["en-es", "es-en", "fr-en"]
     
+    def test_load_config_cached(self, monkeypatch):
+        """Test repeated loads return independent copies"""
+        monkeypatch.setenv("RATE_LIMIT_RPM", "200")
+        
+        # Load config twice, modifying the first copy
+        first = load_config(None)
+        first["rate_limit"]["requests_per_minute"] = 1
+        second = load_config(None)
+        
+        # Assertions - cached result is unaffected
+        assert second["rate_limit"]["requests_per_minute"] == 200
+        
+        # Changed environment is picked up
+        monkeypatch.setenv("RATE_LIMIT_RPM", "300")
+        assert load_config(None)["rate_limit"]["requests_per_minute"] == 300
+    
     def test_config_priority(self, monkeypatch):
         """Test configuration priority (env vars override file)"""
         # Create temporary config file
@@ -0,0 +1,152 @@
+# tests/test_helpers.py
+import pytest
+from functools import partial
+from unittest.mock import MagicMock, call
+from cachetools import TTLCache
+from flask import Flask, g, jsonify
+from app.utils import helpers
+from app.utils.helpers import CacheInfo, timed_lru_cache, validate_request_json
+
+class FakeTimer:
+    """Stands in for the cache's time.monotonic, advanced manually"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def timer(monkeypatch):
+    """Make caches created by timed_lru_cache use a FakeTimer"""
+    fake = FakeTimer()
+    monkeypatch.setattr(helpers, "TTLCache", partial(TTLCache, timer=fake))
+    return fake
+
+@pytest.fixture
+def func():
+    """Function to cache, returning its argument doubled"""
+    return MagicMock(side_effect=lambda x: x * 2)
+
+class TestTimedLruCache:
+    """Tests for the timed_lru_cache decorator"""
+
+    def test_cached(self, timer, func):
+        """Test repeated calls are served from the cache"""
+        cached = timed_lru_cache(seconds=10, maxsize=4)(func)
+
+        results = [cached(1), cached(1)]
+
+        # Assertions
+        assert results == [2, 2]
+        assert func.call_args_list == [call(1)]
+
+    def test_entries_expire_individually(self, timer, func):
+        """Test an entry expires after `seconds` while newer entries survive"""
+        cached = timed_lru_cache(seconds=10, maxsize=4)(func)
+        cached(1)
+        timer.now = 6
+        cached(2)
+
+        # Past the first entry's lifetime, within the second's
+        timer.now = 11
+        cached(1)
+        cached(2)
+
+        # Assertions
+        assert func.call_args_list == [call(1), call(2), call(1)]
+
+    def test_maxsize_evicts_least_recently_used(self, timer, func):
+        """Test a full cache evicts the least recently used entry"""
+        cached = timed_lru_cache(seconds=10, maxsize=2)(func)
+        cached(1)
+        cached(2)
+        # Use 1 so 2 becomes the least recently used
+        cached(1)
+        cached(3)
+        func.reset_mock()
+
+        cached(1)
+        cached(2)
+
+        # Assertions
+        assert func.call_args_list == [call(2)]
+
+    def test_exceptions_not_cached(self, timer, func):
+        """Test a call that raises is retried on the next call"""
+        func.side_effect = [ValueError("Test error"), 4]
+        cached = timed_lru_cache(seconds=10, maxsize=4)(func)
+
+        with pytest.raises(ValueError):
+            cached(2)
+        result = cached(2)
+
+        # Assertions
+        assert result == 4
+        assert func.call_count == 2
+
+    def test_cache_info_and_clear(self, timer, func):
+        """Test cache_info counts hits and misses, and cache_clear resets them"""
+        cached = timed_lru_cache(seconds=10, maxsize=4)(func)
+        cached(1)
+        cached(1)
+        cached(2)
+
+        info = cached.cache_info()
+        cached.cache_clear()
+
+        # Assertions
+        assert info == CacheInfo(hits=1, misses=2, maxsize=4, currsize=2)
+        assert cached.cache_info() == CacheInfo(hits=0, misses=0, maxsize=4, currsize=0)
+        # Cleared entries are computed again
+        cached(1)
+        assert func.call_count == 3
+
+    def test_cache_info_drops_expired(self, timer, func):
+        """Test cache_info does not count expired entries"""
+        cached = timed_lru_cache(seconds=10, maxsize=4)(func)
+        cached(1)
+        timer.now = 10
+
+        # Assertions
+        assert cached.cache_info().currsize == 0
+
+@pytest.fixture
+def json_client():
+    """Test client for a throwaway view requiring the text and source fields"""
+    app = Flask(__name__)
+
+    @app.route('/echo', methods=['POST'])
+    @validate_request_json(["text", "source"])
+    def echo():
+        return jsonify(g.json)
+
+    return app.test_client()
+
+class TestValidateRequestJson:
+    """Tests for the validate_request_json decorator"""
+
+    def test_malformed_json(self, json_client):
+        """Test a body that is not valid JSON is rejected"""
+        response = json_client.post('/echo', data='{"text":', content_type='application/json')
+
+        # Assertions
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Invalid JSON"}
+
+    def test_missing_field(self, json_client):
+        """Test a body missing a required field is rejected"""
+        response = json_client.post('/echo', json={"text": "Hello world"})
+
+        # Assertions
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Missing required fields: source"}
+
+    def test_valid(self, json_client):
+        """Test a valid body reaches the view through g.json"""
+        payload = {"text": "Hello world", "source": "en"}
+        response = json_client.post('/echo', json=payload)
+
+        # Assertions
+        assert response.status_code == 200
+        assert response.get_json() == payload
@@ -0,0 +1,109 @@
+# tests/test_rate_limiter.py
+import pytest
+from types import SimpleNamespace
+from app.services import rate_limiter
+from app.services.rate_limiter import RateLimiter
+
+class FakeClock:
+    """Stands in for time.monotonic_ns, advanced manually in seconds"""
+
+    def __init__(self):
+        self.now_ns = 0
+
+    def advance(self, seconds):
+        self.now_ns += int(seconds * 1_000_000_000)
+
+    def monotonic_ns(self):
+        return self.now_ns
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the rate limiter's clock with a FakeClock"""
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic_ns=fake.monotonic_ns))
+    return fake
+
+@pytest.fixture
+def limiter(clock):
+    """One token per second, bursting to two"""
+    return RateLimiter(requests_per_minute=60, burst=2)
+
+class TestRateLimiter:
+    """Tests for the token bucket rate limiter"""
+
+    def test_burst_then_limited(self, limiter):
+        """Test the burst is allowed and the next request is rejected"""
+        results = [limiter.check([]) for _ in range(3)]
+
+        # Assertions
+        assert results == [True, True, False]
+
+    def test_refill(self, limiter, clock):
+        """Test tokens are refilled over time"""
+        limiter.check([])
+        limiter.check([])
+
+        # Half a token is not enough, a whole one is
+        clock.advance(0.5)
+        half = limiter.check([])
+        clock.advance(0.5)
+        whole = limiter.check([])
+
+        # Assertions
+        assert half is False
+        assert whole is True
+
+    def test_refill_capped_at_burst(self, limiter, clock):
+        """Test idle time does not accumulate more than the burst"""
+        clock.advance(3600)
+        results = [limiter.check([]) for _ in range(3)]
+
+        # Assertions
+        assert results == [True, True, False]
+
+    def test_headers(self, limiter):
+        """Test the headers of allowed and rejected requests"""
+        allowed_headers = []
+        limiter.check(allowed_headers)
+        limiter.check([])
+        rejected_headers = []
+        limiter.check(rejected_headers)
+
+        # Assertions
+        assert allowed_headers == [
+            ('X-RateLimit-Limit', '60'),
+            ('X-RateLimit-Remaining', '2.0'),
+            ('X-RateLimit-Reset', '0'),
+        ]
+        # Two seconds until the bucket is full, one until the next token
+        assert rejected_headers == [
+            ('X-RateLimit-Limit', '60'),
+            ('X-RateLimit-Remaining', '0.0'),
+            ('X-RateLimit-Reset', '2'),
+            ('Retry-After', '1'),
+        ]
+
+    def test_retry_after_honoured(self, limiter, clock):
+        """Test a request is allowed after waiting Retry-After seconds"""
+        limiter.check([])
+        limiter.check([])
+        headers = []
+        limiter.check(headers)
+
+        clock.advance(int(dict(headers)['Retry-After']))
+
+        # Assertions
+        assert limiter.check([]) is True
+
+    def test_peek_does_not_consume(self, limiter):
+        """Test peek reports the state without taking a token"""
+        limiter.check([])
+        peek_headers = []
+        limiter.peek(peek_headers)
+        limiter.peek([])
+
+        # Assertions
+        assert dict(peek_headers)['X-RateLimit-Remaining'] == '1.0'
+        assert 'Retry-After' not in dict(peek_headers)
+        assert limiter.check([]) is True
+        assert limiter.check([]) is False
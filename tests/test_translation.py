@@ -1,114 +1,256 @@
 # tests/test_translation.py
+import logging
 import pytest
-from unittest.mock import patch, MagicMock
+from filelock import FileLock
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call
+from app.services import translation_service
 from app.services.translation_service import TranslationPackageManager
 
 class TestTranslationService:
     """Tests for the translation service"""
     
-    @pytest.fixture
-    def mock_argos(self):
-        """Mock argostranslate for testing"""
-        with patch('app.services.translation_service.argostranslate.package'), \
-             patch('app.services.translation_service.argostranslate.translate'):
-            yield
-    
-    def test_init(self, mock_argos):
+    def test_init(self, manager):
         """Test initialization"""
-        manager = TranslationPackageManager()
         assert isinstance(manager.installed_packages, set)
         assert len(manager.installed_packages) == 0
     
-    def test_install_package(self, mock_argos):
-        """Test package installation"""
-        with patch('app.services.translation_service.argostranslate.package') as mock_package:
-            # Create a mock package
-            mock_pkg = MagicMock()
-            mock_pkg.from_code = "en"
-            mock_pkg.to_code = "es"
-            
-            # Set up mocks
-            mock_package.get_available_packages.return_value = [mock_pkg]
-            mock_pkg.download.return_value = "/tmp/package.argosmodel"
-            
-            # Create manager and test installation
-            manager = TranslationPackageManager()
-            result = manager.install_package("en", "es")
-            
-            # Assertions
-            assert result is True
-            assert "en-es" in manager.installed_packages
-            mock_pkg.download.assert_called_once()
-            mock_package.install_from_path.assert_called_once_with("/tmp/package.argosmodel")
-    
-    def test_install_configured_packages(self, mock_argos):
-        """Test installation of multiple packages"""
+    def test_available_packages_cached(self, mock_package):
+        """Test the package index is fetched once and then read from disk"""
+        mock_package.get_available_packages.return_value = [
+            SimpleNamespace(from_code="en", to_code="es")
+        ]
+        
+        # Create two managers, as two workers would
+        TranslationPackageManager()
         manager = TranslationPackageManager()
         
-        # Mock the install_package method
-        manager.install_package = MagicMock(return_value=True)
+        # Assertions
+        assert mock_package.update_package_index.call_count == 1
+        assert ("en", "es") in manager._available_index
+    
+    def test_available_packages_lock_timeout(self, mock_package, monkeypatch):
+        """Test a held index lock times out instead of blocking startup"""
+        monkeypatch.setattr(translation_service, "INDEX_LOCK_TIMEOUT", 0.1)
         
-        # Install packages
-        manager.install_configured_packages(["en-es", "fr-en", "de-en"])
-        
-        # Verify calls
-        assert manager.install_package.call_count == 3
-        manager.install_package.assert_any_call("en", "es")
-        manager.install_package.assert_any_call("fr", "en")
-        manager.install_package.assert_any_call("de", "en")
-    
-    def test_translate(self, mock_argos):
-        """Test translation functionality"""
-        with patch('app.services.translation_service.argostranslate.translate') as mock_translate:
-            # Set up mocks
-            mock_from_lang = MagicMock()
-            mock_to_lang = MagicMock()
-            mock_translation = MagicMock()
-            
-            mock_from_lang.code = "en"
-            mock_to_lang.code = "es"
-            mock_translate.get_installed_languages.return_value = [mock_from_lang, mock_to_lang]
-            mock_from_lang.get_translation.return_value = mock_translation
-            mock_translation.translate.return_value = "Hola mundo"
-            
-            # Create manager
+        # Hold the lock as a stuck worker would
+        with FileLock(f"{translation_service.INDEX_CACHE_PATH}.lock"):
             manager = TranslationPackageManager()
-            manager.installed_packages.add("en-es")  # Pretend the package is installed
-            
-            # Test translation
-            result = manager.translate("Hello world", "en", "es", "Fallback")
-            
-            # Assertions
-            assert result == "Hola mundo"
-            mock_from_lang.get_translation.assert_called_once_with(mock_to_lang)
-            mock_translation.translate.assert_called_once_with("Hello world")
-    
-    def test_translate_fallback(self, mock_argos):
-        """Test fallback when translation fails"""
+        
+        # Assertions
+        assert mock_package.update_package_index.call_count == 0
+        assert manager.available_packages == []
+    
+    def test_install_package(self, mock_package, tmp_path):
+        """Test package installation"""
+        # Set up mocks
+        downloads_dir = tmp_path / "downloads"
+        downloads_dir.mkdir()
+        download_path = downloads_dir / "package.argosmodel"
+        download_path.write_bytes(b"model")
+        
+        # Create a stub package; only download needs call tracking
+        mock_pkg = SimpleNamespace(from_code="en", to_code="es", download=MagicMock(return_value=str(download_path)))
+        mock_package.get_available_packages.return_value = [mock_pkg]
+        installed_from = []
+        mock_package.install_from_path.side_effect = lambda path: installed_from.append(open(path, 'rb').read())
+        
+        # Create manager and test installation
         manager = TranslationPackageManager()
+        result = manager.install_package("en", "es")
+        
+        # Assertions
+        assert result is True
+        assert "en-es" in manager.installed_packages
+        assert mock_pkg.download.call_count == 1
+        assert mock_package.install_from_path.call_count == 1
+        assert installed_from == [b"model"]
+        # The downloaded file is removed after installing
+        assert list(downloads_dir.iterdir()) == []
+    
+    @pytest.mark.parametrize("sync_interval,scans", [(3600, 1), (0, 2)])
+    def test_install_package_sync_debounced(self, manager, mock_package, monkeypatch, sync_interval, scans):
+        """Test install_package rescans the disk at most once per SYNC_INTERVAL"""
+        monkeypatch.setattr(translation_service, "SYNC_INTERVAL", sync_interval)
+        # The scan on init does not count
+        manager._last_sync = None
+        mock_package.get_installed_packages.reset_mock()
         
-        # Mock install_package to fail
-        manager.install_package = MagicMock(return_value=False)
+        # Two uncached pairs, neither in the index
+        manager.install_package("en", "es", refresh_index=False)
+        manager.install_package("fr", "en", refresh_index=False)
         
-        # Test translation with package installation failure
-        result = manager.translate("Hello world", "en", "es", "Fallback message")
+        # Assertions
+        assert mock_package.get_installed_packages.call_count == scans
+    
+    def test_sync_forced(self, manager, mock_package, monkeypatch):
+        """Test a forced sync scans the disk within SYNC_INTERVAL"""
+        monkeypatch.setattr(translation_service, "SYNC_INTERVAL", 3600)
+        mock_package.get_installed_packages.reset_mock()
+        
+        manager._sync_installed_packages(force=True)
+        manager._sync_installed_packages(force=True)
         
         # Assertions
-        assert result == "Fallback message"
-        manager.install_package.assert_called_once_with("en", "es")
+        assert mock_package.get_installed_packages.call_count == 2
     
-    def test_translate_exception(self, mock_argos):
-        """Test handling of exceptions during translation"""
-        with patch('app.services.translation_service.argostranslate.translate') as mock_translate:
-            # Set up mock to raise exception
+    @pytest.fixture
+    def package_index(self, mock_package, tmp_path):
+        """Available en-es, fr-en and de-en packages, downloading to tmp_path"""
+        mock_pkgs = {}
+        for from_code, to_code in [("en", "es"), ("fr", "en"), ("de", "en")]:
+            download_path = tmp_path / f"{from_code}_{to_code}.argosmodel"
+            download_path.write_bytes(f"{from_code}-{to_code}".encode())
+            mock_pkgs[f"{from_code}-{to_code}"] = SimpleNamespace(
+                from_code=from_code, to_code=to_code, download=MagicMock(return_value=str(download_path))
+            )
+        mock_package.get_available_packages.return_value = list(mock_pkgs.values())
+        return mock_pkgs
+    
+    @pytest.fixture
+    def indexed_manager(self, package_index):
+        """Create a manager that sees the package_index packages as available"""
+        return TranslationPackageManager()
+    
+    @pytest.mark.parametrize("packages_list,expected", [
+        (["en-es"], {"en-es"}),
+        (["en-es", "fr-en", "de-en"], {"en-es", "fr-en", "de-en"}),
+        (["en-es", "en-es", "invalid"], {"en-es"}),
+    ])
+    def test_install_configured_packages(self, indexed_manager, package_index, mock_package, packages_list, expected):
+        """Test installation of multiple packages"""
+        installed_from = []
+        mock_package.install_from_path.side_effect = lambda path: installed_from.append(open(path, 'rb').read())
+        indexed_manager._finalize_install = MagicMock(wraps=indexed_manager._finalize_install)
+        
+        # Install packages
+        indexed_manager.install_configured_packages(packages_list)
+        
+        # Verify each expected package was downloaded and installed once
+        assert indexed_manager.installed_packages == expected
+        for package_key, mock_pkg in package_index.items():
+            assert mock_pkg.download.call_count == (package_key in expected)
+        assert indexed_manager._finalize_install.call_count == len(expected)
+        indexed_manager._finalize_install.assert_has_calls(
+            [call(key, package_index[key].download.return_value) for key in expected], any_order=True
+        )
+        assert mock_package.install_from_path.call_count == len(expected)
+        assert sorted(installed_from) == sorted(key.encode() for key in expected)
+    
+    @pytest.mark.parametrize("scenario,fallback,expected", [
+        ("success", "Fallback", "Hola mundo"),
+        ("fallback", "Fallback message", "Fallback message"),
+        ("exception", "Fallback for error", "Fallback for error"),
+    ])
+    def test_translate(self, installed_manager, lang_mocks, mock_translate, scenario, fallback, expected):
+        """Test translation, and the fallback when the package is missing or translation raises"""
+        mock_from_lang, mock_to_lang, mock_translation = lang_mocks
+        if scenario == "fallback":
+            # Language not installed, and installing the package fails
+            mock_translate.get_installed_languages.return_value = []
+            installed_manager.install_package = MagicMock(return_value=False)
+        elif scenario == "exception":
             mock_translate.get_installed_languages.side_effect = Exception("Test error")
-            
-            # Create manager
-            manager = TranslationPackageManager()
-            manager.installed_packages.add("en-es")  # Pretend the package is installed
-            
-            # Test translation with exception
-            result = manager.translate("Hello world", "en", "es", "Fallback for error")
-            
-            # Assertions
-            assert result == "Fallback for error"
\ No newline at end of file
+        
+        # Test translation
+        result = installed_manager.translate("Hello world", "en", "es", fallback)
+        
+        # Assertions
+        assert result == expected
+        if scenario == "success":
+            assert mock_from_lang.get_translation.call_args_list == [call(mock_to_lang)]
+            assert mock_translation.translate.call_args_list == [call("Hello world")]
+        elif scenario == "fallback":
+            assert installed_manager.install_package.call_args_list == [call("en", "es", refresh_index=False)]
+    
+    @pytest.mark.parametrize("error", [KeyError("token"), IndexError("out of range")])
+    def test_translate_model_lookup_error(self, installed_manager, lang_mocks, caplog, error):
+        """Test KeyError and IndexError from the model are logged, not taken for a missing pair"""
+        mock_from_lang, mock_to_lang, mock_translation = lang_mocks
+        mock_translation.translate.side_effect = error
+        
+        # Test translation
+        result = installed_manager.translate("Hello world", "en", "es", "Fallback")
+        
+        # Assertions
+        assert result == "Fallback"
+        assert [record.levelname for record in caplog.records if record.levelno >= logging.WARNING] == ["ERROR"]
+    
+    def test_translate_missing_package(self, manager, mock_package, mock_translate):
+        """Test a missing package is installed on demand once, without refreshing the index"""
+        mock_translate.get_installed_languages.return_value = []
+        manager.install_package = MagicMock(wraps=manager.install_package)
+        
+        # Translate different texts so the result cache is not involved
+        results = [manager.translate(f"Hello {i}", "fr", "en", "Fallback") for i in range(3)]
+        
+        # Assertions
+        assert results == ["Fallback"] * 3
+        assert manager.install_package.call_args_list == [call("fr", "en", refresh_index=False)]
+        # Only the index download from __init__
+        assert mock_package.update_package_index.call_count == 1
+    
+    def test_translate_cached(self, manager, lang_mocks):
+        """Test repeated translations are served from the cache"""
+        mock_from_lang, mock_to_lang, mock_translation = lang_mocks
+        
+        # Translate the same text twice
+        first = manager.translate("Hello world", "en", "es", "Fallback")
+        second = manager.translate("Hello world", "en", "es", "Fallback")
+        
+        # Assertions
+        assert first == second == "Hola mundo"
+        assert mock_translation.translate.call_args_list == [call("Hello world")]
+    
+    @pytest.mark.parametrize("trigger,rebuilt", [
+        ("sync_changed", True),
+        ("sync_unchanged", False),
+        ("install", True),
+    ])
+    def test_language_tables_rebuilt(self, manager, mock_package, mock_translate, lang_mocks, tmp_path, trigger, rebuilt):
+        """Test the language lookups are reloaded when the installed packages change"""
+        manager.translate("Hello world", "en", "es", "Fallback")
+        
+        # Replace the installed languages with a new en-es translation
+        new_from_lang, new_to_lang, new_translation = MagicMock(), MagicMock(), MagicMock()
+        new_from_lang.code = "en"
+        new_to_lang.code = "es"
+        new_from_lang.get_translation.return_value = new_translation
+        new_translation.translate.return_value = "Hola de nuevo"
+        mock_translate.get_installed_languages.return_value = [new_from_lang, new_to_lang]
+        
+        if trigger == "sync_changed":
+            mock_package.get_installed_packages.return_value = [SimpleNamespace(from_code="en", to_code="es")]
+            manager._sync_installed_packages(force=True)
+        elif trigger == "sync_unchanged":
+            manager._sync_installed_packages(force=True)
+        else:
+            download_path = tmp_path / "en_es.argosmodel"
+            download_path.write_bytes(b"model")
+            manager._finalize_install("en-es", str(download_path))
+        
+        # Different text so the result cache is not involved
+        result = manager.translate("Good morning", "en", "es", "Fallback")
+        
+        # Assertions
+        assert mock_translate.get_installed_languages.call_count == (2 if rebuilt else 1)
+        assert result == ("Hola de nuevo" if rebuilt else "Hola mundo")
+    
+    def test_translate_passthrough(self, manager, mock_translate):
+        """Test empty text and same-language requests skip the model"""
+        # Assertions
+        assert manager.translate("", "en", "es", "Fallback") == ""
+        assert manager.translate("  \n", "en", "es", "Fallback") == "  \n"
+        assert manager.translate("Hello world", "en", "en", "Fallback") == "Hello world"
+        mock_translate.get_installed_languages.assert_not_called()
+    
+    def test_warmup(self, manager, mock_translate, lang_mocks):
+        """Test warmup runs each configured model once"""
+        mock_from_lang, mock_to_lang, mock_translation = lang_mocks
+        
+        # Warm up an installed and a missing pair
+        manager.warmup(["en-es", "fr-en"])
+        
+        # Assertions
+        assert mock_translation.translate.call_args_list == [call(" ")]
+        assert mock_translate.get_installed_languages.call_count == 1